@@ -1,19 +1,14 @@
+import argparse
 import asyncio
 import json
-import aiohttp
-import websockets
 import logging
 import os
 import signal
 import sys
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
-
-import requests
-from colorama import init, Fore, Back, Style
-
-init(autoreset=True)
+from typing import List, Dict, Optional, Any, AsyncIterator, Iterable, Tuple
 
 logging.disable(logging.CRITICAL)
 
@@ -33,6 +28,8 @@ def load_settings():
         sys.exit(1)
 
 async def get_punishments_pages(punish_type: int = 0, search: str = '') -> Dict[str, Any]:
+    import websockets
+
     try:
         async with websockets.connect(WS_URL) as websocket:
             request = {
@@ -52,6 +49,8 @@ async def get_punishments_pages(punish_type: int = 0, search: str = '') -> Dict[
 
 
 async def get_punishments(page: int = 1, punish_type: int = 0, search: str = '', cookies: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    import aiohttp
+
     try:
         cookie_string = '; '.join([f'{name}={value}' for name, value in cookies.items()]) if cookies else ''
 
@@ -121,32 +120,262 @@ Status: {unpunish_status}
         return f"Error formatting punishment: {e}"
 
 
+def save_results(bans_list: Iterable[Dict[str, Any]], output_path: str):
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for i, ban in enumerate(bans_list, 1):
+            created_date = datetime.fromtimestamp(ban['created']).strftime('%d.%m.%Y %H:%M:%S')
+            expires_date = 'Navsegda' if not ban.get('expires') or ban['expires'] == 0 else \
+                          datetime.fromtimestamp(ban['expires']).strftime('%d.%m.%Y %H:%M:%S')
+
+            unpunish_admin_id = ban.get('unpunish_admin_id')
+            status = 'НЕ СНЯТ' if (unpunish_admin_id is None or unpunish_admin_id == 'null') else f'СНЯТ (admin_id: {unpunish_admin_id})'
+
+            f.write(f'{i}. Player: {ban.get("name", "N/A")}\n')
+            f.write(f'   SteamID: {ban["steamid"]}\n')
+            f.write(f'   Created: {created_date}\n')
+            f.write(f'   Expires: {expires_date}\n')
+            f.write(f'   Reason: {ban.get("reason", "N/A")}\n')
+            f.write(f'   Status: {status}\n')
+            f.write('-' * 40 + '\n')
+
+
+BAN_AGE_THRESHOLD_SECONDS = 3 * 24 * 60 * 60
+
+
+def is_target_ban(punishment: Dict[str, Any], current_timestamp: float) -> bool:
+    reason = punishment.get('reason', '').lower()
+    created = punishment.get('created', 0)
+    unpunish_admin_id = punishment.get('unpunish_admin_id')
+
+    is_cheat_ban = ('читы' in reason or 'читерство' in reason or 'чит' in reason)
+    is_old_enough = (current_timestamp - created) > BAN_AGE_THRESHOLD_SECONDS
+    is_unpunished = (unpunish_admin_id is None or unpunish_admin_id == 'null')
+
+    return is_cheat_ban and is_old_enough and is_unpunished
+
+
+RATE_LIMIT_STATUS = 429
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    status = getattr(error, 'status', None) or getattr(error, 'status_code', None)
+    response = getattr(error, 'response', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+    return status == RATE_LIMIT_STATUS
+
+
+class PageLatencyTracker:
+    DEFAULT_TIMEOUT = 45.0
+    MIN_TIMEOUT = 5.0
+    MIN_SAMPLES = 10
+    RATE_LIMIT_MIN_DELAY = 5.0
+    RATE_LIMIT_MAX_DELAY = 60.0
+
+    def __init__(self, window: int = 100, timeout_multiplier: float = 2.0):
+        self.latencies = deque(maxlen=window)
+        self.timeout_multiplier = timeout_multiplier
+        self.consecutive_timeouts = 0
+        self.rate_limit_delay = 0.0
+
+    def record(self, latency: float):
+        self.latencies.append(latency)
+        self.consecutive_timeouts = 0
+        self.rate_limit_delay = self.rate_limit_delay / 2 if self.rate_limit_delay >= 1.0 else 0.0
+
+    def record_timeout(self, timeout: float):
+        self.latencies.append(timeout)
+        self.consecutive_timeouts += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.latencies) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def timeout(self) -> float:
+        if self.consecutive_timeouts >= 2:
+            return self.DEFAULT_TIMEOUT
+        p99 = self.percentile(99)
+        if p99 is None:
+            return self.DEFAULT_TIMEOUT
+        return min(self.DEFAULT_TIMEOUT, max(self.MIN_TIMEOUT, p99 * self.timeout_multiplier))
+
+    def hedge_delay(self) -> Optional[float]:
+        if self.rate_limit_delay:
+            return None
+        return self.percentile(95)
+
+    def slow_down(self):
+        self.rate_limit_delay = min(self.RATE_LIMIT_MAX_DELAY, max(self.RATE_LIMIT_MIN_DELAY, self.rate_limit_delay * 2))
+
+
+async def fetch_page(page: int, tracker: PageLatencyTracker, cookies: Optional[Dict[str, str]] = None, hedge: bool = False, punish_type: int = 0) -> List[Dict[str, Any]]:
+    timeout = tracker.timeout()
+    hedge_delay = tracker.hedge_delay() if hedge else None
+    started = time.monotonic()
+
+    tasks = [asyncio.create_task(get_punishments(page, punish_type, '', cookies))]
+    try:
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                tasks.append(asyncio.create_task(get_punishments(page, punish_type, '', cookies)))
+
+        pending = set(tasks)
+        error = None
+        while pending:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    tracker.record(time.monotonic() - started)
+                    return task.result()
+                error = task.exception()
+
+        if error is not None and not pending:
+            raise error
+        tracker.record_timeout(timeout)
+        raise asyncio.TimeoutError()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def fetch_page_with_retries(page: int, tracker: PageLatencyTracker, cookies: Optional[Dict[str, str]] = None, hedge: bool = False, punish_type: int = 0, retry_errors: bool = False) -> Optional[List[Dict[str, Any]]]:
+    MAX_RETRIES_PER_PAGE = 3
+    MAX_RATE_LIMIT_WAITS = 10
+
+    attempt = 0
+    rate_limit_waits = 0
+    while attempt < MAX_RETRIES_PER_PAGE:
+        page_timeout = tracker.timeout()
+        try:
+            return await fetch_page(page, tracker, cookies, hedge, punish_type)
+        except asyncio.TimeoutError:
+            attempt += 1
+            sys.stdout.write('\r' + ' ' * 50 + '\r')
+            print(f'Таймаут при обработке страницы {page} ({page_timeout:.0f} сек). Попытка {attempt}/{MAX_RETRIES_PER_PAGE}. Переподключение...')
+            await asyncio.sleep(1.0)
+        except Exception as e:
+            if is_rate_limited(e) and rate_limit_waits < MAX_RATE_LIMIT_WAITS:
+                rate_limit_waits += 1
+                tracker.slow_down()
+                print(f'Сервер ограничил частоту запросов на странице {page}. Жду {tracker.rate_limit_delay:.0f} сек...')
+                await asyncio.sleep(tracker.rate_limit_delay)
+                continue
+            if not retry_errors:
+                raise
+            attempt += 1
+            print(f'Ошибка при обработке страницы {page}: {e}. Попытка {attempt}/{MAX_RETRIES_PER_PAGE}.')
+            await asyncio.sleep(3.0)
+
+    return None
+
+
+class PageFetchError(Exception):
+    def __init__(self, page: int, error: Exception):
+        super().__init__(f'страница {page}: {error}')
+        self.page = page
+        self.error = error
+
+
+async def iter_punishment_pages(cookies: Optional[Dict[str, str]] = None, start_page: int = 1, end_page: Optional[int] = None, punish_type: int = 0, hedge: bool = False, delay: float = 1.0, retry_errors: bool = False, skip_failed_pages: bool = False) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    tracker = PageLatencyTracker()
+
+    async def load(page: int, wait: float) -> List[Dict[str, Any]]:
+        wait += tracker.rate_limit_delay
+        if wait:
+            await asyncio.sleep(wait)
+        try:
+            punishments = await fetch_page_with_retries(page, tracker, cookies, hedge, punish_type, retry_errors)
+        except Exception as e:
+            raise PageFetchError(page, e) from e
+
+        if punishments is None:
+            if not skip_failed_pages:
+                raise PageFetchError(page, RuntimeError('все попытки загрузки исчерпаны'))
+            print(f'Пропускаю страницу {page}: все попытки загрузки исчерпаны.')
+            return []
+        return punishments
+
+    page = start_page
+    task = asyncio.create_task(load(page, 0))
+    try:
+        while task is not None:
+            punishments = await task
+            task = None
+            if end_page is None or page < end_page:
+                task = asyncio.create_task(load(page + 1, delay))
+
+            yield page, punishments
+            page += 1
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+
+
+async def iter_punishments(cookies: Optional[Dict[str, str]] = None, start_page: int = 1, end_page: Optional[int] = None, punish_type: int = 0, created_after: Optional[float] = None, created_before: Optional[float] = None, hedge: bool = False, delay: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+    pages = iter_punishment_pages(cookies, start_page, end_page, punish_type, hedge, delay, retry_errors=True)
+    try:
+        async for page, punishments in pages:
+            if not punishments and end_page is None:
+                break
+
+            for punishment in punishments:
+                created = punishment.get('created', 0)
+                if created_after is not None and created < created_after:
+                    continue
+                if created_before is not None and created >= created_before:
+                    continue
+                yield punishment
+
+            if created_after is not None and punishments and all(p.get('created', 0) < created_after for p in punishments):
+                break
+    finally:
+        await pages.aclose()
+
+
+async def export_punishments(output_path: str, cookies: Optional[Dict[str, str]] = None, start_page: int = 1, end_page: Optional[int] = None, punish_type: int = 0, created_after: Optional[float] = None, created_before: Optional[float] = None, hedge: bool = False) -> int:
+    exported = 0
+    punishments = iter_punishments(cookies, start_page, end_page, punish_type, created_after, created_before, hedge)
+    try:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            async for punishment in punishments:
+                f.write(format_punishment(punishment) + '\n')
+                exported += 1
+    finally:
+        await punishments.aclose()
+
+    print(f'Выгружено {exported} наказаний в {os.path.basename(output_path)}')
+    return exported
+
+
 async def get_punishments_older_than(cookies: Optional[Dict[str, str]] = None, days_threshold: int = 5) -> List[Dict[str, Any]]:
     all_punishments = []
-    page = 1
     threshold_timestamp = time.time() - (days_threshold * 24 * 60 * 60)
 
-    while True:
-        try:
-            punishments = await get_punishments(page, 0, '', cookies)
+    pages = iter_punishment_pages(cookies, 1, delay=0.5)
+    try:
+        async for page, punishments in pages:
             if not punishments:
                 break
-            has_old_punishments = any(p.get('created', 0) < threshold_timestamp for p in punishments)
             all_punishments.extend(punishments)
-            if not has_old_punishments:
+            if not any(p.get('created', 0) < threshold_timestamp for p in punishments):
                 break
-
-            page += 1
-            await asyncio.sleep(0.5)
-
-        except Exception as e:
-            print(f'Ошибка при загрузке страницы {page}: {e}')
-            break
+    except PageFetchError as e:
+        print(f'Ошибка при загрузке страницы {e.page}: {e.error}')
+    finally:
+        await pages.aclose()
 
     return all_punishments
 
 
-async def run_parser(cookies: Optional[Dict[str, str]] = None, start_page: int = 100, num_bans_to_find: Optional[int] = None):
+async def run_parser(cookies: Optional[Dict[str, str]] = None, start_page: int = 100, num_bans_to_find: Optional[int] = None, output_path: Optional[str] = None, hedge: bool = False, show_progress: bool = True, raise_errors: bool = False):
     if num_bans_to_find is None:
         try:
             user_input = input('Введите количество банов за читы: ')
@@ -158,7 +387,6 @@ async def run_parser(cookies: Optional[Dict[str, str]] = None, start_page: int =
             print('Неверный ввод. Использую значение по умолчанию: 10')
             num_bans_to_find = 10
 
-    BAN_AGE_THRESHOLD_SECONDS = 3 * 24 * 60 * 60
     current_timestamp = time.time()
 
     current_page = start_page
@@ -167,30 +395,21 @@ async def run_parser(cookies: Optional[Dict[str, str]] = None, start_page: int =
 
     frame_index = 0
     consecutive_empty_pages = 0
-    retry_count = 0
-    MAX_RETRIES_PER_PAGE = 3
+    MAX_EMPTY_PAGES = 10
 
-    def save_results(bans_list):
+    if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), 'output.txt')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for i, ban in enumerate(bans_list, 1):
-                created_date = datetime.fromtimestamp(ban['created']).strftime('%d.%m.%Y %H:%M:%S')
-                expires_date = 'Navsegda' if not ban.get('expires') or ban['expires'] == 0 else \
-                              datetime.fromtimestamp(ban['expires']).strftime('%d.%m.%Y %H:%M:%S')
-
-                unpunish_admin_id = ban.get('unpunish_admin_id')
-                status = 'НЕ СНЯТ' if (unpunish_admin_id is None or unpunish_admin_id == 'null') else f'СНЯТ (admin_id: {unpunish_admin_id})'
-
-                f.write(f'{i}. Player: {ban.get("name", "N/A")}\n')
-                f.write(f'   SteamID: {ban["steamid"]}\n')
-                f.write(f'   Created: {created_date}\n')
-                f.write(f'   Expires: {expires_date}\n')
-                f.write(f'   Reason: {ban.get("reason", "N/A")}\n')
-                f.write(f'   Status: {status}\n')
-                f.write('-' * 40 + '\n')
+    output_name = os.path.basename(output_path)
+
+    def clear_progress():
+        if show_progress:
+            sys.stdout.write('\r' + ' ' * 50 + '\r')
+            sys.stdout.flush()
 
     async def update_animation():
         nonlocal frame_index
+        if not show_progress:
+            return
         try:
             while len(collected_bans) < num_bans_to_find:
                 frame = loading_frames[frame_index % len(loading_frames)]
@@ -202,95 +421,164 @@ async def run_parser(cookies: Optional[Dict[str, str]] = None, start_page: int =
             pass
 
     animation_task = asyncio.create_task(update_animation())
+    pages = iter_punishment_pages(cookies, start_page, hedge=hedge, skip_failed_pages=True)
 
     try:
-        while len(collected_bans) < num_bans_to_find:
-            try:
-                punishments = await asyncio.wait_for(
-                    get_punishments(current_page, 0, '', cookies),
-                    timeout=45.0
-                )
-
-                if not punishments:
-                    consecutive_empty_pages += 1
-                    current_page += 1
-                    continue
+        async for current_page, punishments in pages:
+            if not punishments:
+                consecutive_empty_pages += 1
+                if consecutive_empty_pages >= MAX_EMPTY_PAGES:
+                    clear_progress()
+                    print(f'{MAX_EMPTY_PAGES} пустых страниц подряд (до {current_page}). Похоже, история закончилась.')
+                    break
+                continue
 
-                consecutive_empty_pages = 0
-                retry_count = 0
-
-                cheat_bans_on_page = 0
-                for punishment in punishments:
-                    reason = punishment.get('reason', '').lower()
-                    created = punishment.get('created', 0)
-                    unpunish_admin_id = punishment.get('unpunish_admin_id')
-
-                    is_cheat_ban = ('читы' in reason or 'читерство' in reason or 'чит' in reason)
-                    is_old_enough = (current_timestamp - created) > BAN_AGE_THRESHOLD_SECONDS
-                    is_unpunished = (unpunish_admin_id is None or unpunish_admin_id == 'null')
-
-                    if is_cheat_ban and is_old_enough and is_unpunished:
-                        collected_bans.append(punishment)
-                        cheat_bans_on_page += 1
-                        if len(collected_bans) >= num_bans_to_find:
-                            break
-
-                if current_page % 50 == 0:
-                    print(f'\nПрогресс: страница {current_page}, найдено {len(collected_bans)}/{num_bans_to_find} банов')
-
-                current_page += 1
-                retry_count = 0
-                await asyncio.sleep(1.0)
-
-            except asyncio.TimeoutError:
-                retry_count += 1
-                if retry_count >= MAX_RETRIES_PER_PAGE:
-                    animation_task.cancel()
-                    sys.stdout.write('\r' + ' ' * 50 + '\r')
-                    print(f'Таймаут при обработке страницы {current_page} после {MAX_RETRIES_PER_PAGE} попыток. Пропускаю страницу.')
-                    consecutive_empty_pages += 1
-                    retry_count = 0
-                    current_page += 1
-                    await asyncio.sleep(2.0)
-                    continue
+            consecutive_empty_pages = 0
 
-                sys.stdout.write('\r' + ' ' * 50 + '\r')
-                print(f'Таймаут при обработке страницы {current_page} (45 сек). Попытка {retry_count}/{MAX_RETRIES_PER_PAGE}. Переподключение...')
-                await asyncio.sleep(3.0)
-                continue
-            except Exception as e:
-                animation_task.cancel()
-                sys.stdout.write('\r' + ' ' * 50 + '\r')
-                print(f'Ошибка при обработке страницы {current_page}: {e}')
-                if collected_bans:
-                    print(f'Сохраняю {len(collected_bans)} найденных результатов...')
-                    save_results(collected_bans)
-                    print('Результаты сохранены в output.txt')
-                return collected_bans
+            for punishment in punishments:
+                if is_target_ban(punishment, current_timestamp):
+                    collected_bans.append(punishment)
+                    if len(collected_bans) >= num_bans_to_find:
+                        break
+
+            if current_page % 50 == 0:
+                print(f'\nПрогресс: страница {current_page}, найдено {len(collected_bans)}/{num_bans_to_find} банов')
+
+            if len(collected_bans) >= num_bans_to_find:
+                break
 
     except KeyboardInterrupt:
         animation_task.cancel()
-        sys.stdout.write('\r' + ' ' * 50 + '\r')
+        clear_progress()
         print(f'\nПарсер остановлен пользователем!')
         if collected_bans:
             print(f'Сохраняю {len(collected_bans)} найденных результатов...')
-            save_results(collected_bans)
-            print('Результаты сохранены в output.txt')
+            save_results(collected_bans, output_path)
+            print(f'Результаты сохранены в {output_name}')
         else:
             print('Результаты не найдены.')
         return collected_bans
 
+    except Exception as e:
+        animation_task.cancel()
+        clear_progress()
+        if isinstance(e, PageFetchError):
+            print(f'Ошибка при обработке страницы {e.page}: {e.error}')
+        else:
+            print(f'Ошибка при обработке страницы {current_page}: {e}')
+        if collected_bans:
+            print(f'Сохраняю {len(collected_bans)} найденных результатов...')
+            save_results(collected_bans, output_path)
+            print(f'Результаты сохранены в {output_name}')
+        if raise_errors:
+            raise
+        return collected_bans
+
     finally:
         animation_task.cancel()
-        sys.stdout.write('\r' + ' ' * 50 + '\r')
-        sys.stdout.flush()
+        await pages.aclose()
+        clear_progress()
 
     if collected_bans:
-        print(f'Найдено {len(collected_bans)} банов за читы. Сохраняю в output.txt...')
-        save_results(collected_bans)
-        print('Результаты сохранены в output.txt')
+        print(f'Найдено {len(collected_bans)} банов за читы. Сохраняю в {output_name}...')
+        save_results(collected_bans, output_path)
+        print(f'Результаты сохранены в {output_name}')
         return collected_bans
 
+def get_total_pages(pages_response: Dict[str, Any]) -> int:
+    pages = pages_response.get('pages')
+    if isinstance(pages, bool) or not isinstance(pages, int):
+        raise ValueError(f'Ответ get_punishments_pages не содержит числового поля pages: {pages_response}. Укажите --end-page вручную.')
+    return pages
+
+
+def split_page_range(start_page: int, end_page: int, num_shards: int) -> List[tuple]:
+    total = end_page - start_page + 1
+    num_shards = max(1, min(num_shards, total))
+    base, extra = divmod(total, num_shards)
+
+    shards = []
+    shard_start = start_page
+    for i in range(num_shards):
+        shard_end = shard_start + base - 1 + (1 if i < extra else 0)
+        shards.append((shard_start, shard_end))
+        shard_start = shard_end + 1
+    return shards
+
+
+async def crawl_page_range(start_page: int, end_page: int, current_timestamp: float, cookies: Optional[Dict[str, str]] = None, hedge: bool = False) -> List[tuple]:
+    found = []
+
+    pages = iter_punishment_pages(cookies, start_page, end_page, hedge=hedge, retry_errors=True, skip_failed_pages=True)
+    try:
+        async for page, punishments in pages:
+            for punishment in punishments:
+                if is_target_ban(punishment, current_timestamp):
+                    found.append((page, punishment))
+    finally:
+        await pages.aclose()
+
+    return found
+
+
+def _crawl_shard(shard: tuple) -> List[tuple]:
+    start_page, end_page, current_timestamp, cookies, hedge = shard
+    return asyncio.run(crawl_page_range(start_page, end_page, current_timestamp, cookies, hedge))
+
+
+def merge_shard_results(shard_results: List[List[tuple]]) -> List[Dict[str, Any]]:
+    merged = []
+    seen = set()
+    for page, punishment in sorted((item for result in shard_results for item in result), key=lambda item: item[0]):
+        key = punishment.get('id') or (punishment.get('steamid'), punishment.get('created'))
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(punishment)
+    return merged
+
+
+DEFAULT_CRAWL_WORKERS = 4
+
+
+def run_sharded_parser(cookies: Optional[Dict[str, str]] = None, start_page: int = 1, end_page: Optional[int] = None, workers: Optional[int] = None, num_bans_to_find: Optional[int] = None, output_path: Optional[str] = None, hedge: bool = False) -> List[Dict[str, Any]]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), 'output.txt')
+    output_name = os.path.basename(output_path)
+
+    if end_page is None:
+        end_page = get_total_pages(asyncio.run(get_punishments_pages()))
+    if end_page < start_page:
+        print(f'Нет страниц для парсинга ({start_page}-{end_page})')
+        return []
+
+    workers = workers or min(DEFAULT_CRAWL_WORKERS, os.cpu_count() or 1)
+    current_timestamp = time.time()
+    shards = split_page_range(start_page, end_page, workers)
+
+    print(f'Парсинг страниц {start_page}-{end_page} в {len(shards)} процессах...')
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        shard_results = list(executor.map(
+            _crawl_shard,
+            [(shard_start, shard_end, current_timestamp, cookies, hedge) for shard_start, shard_end in shards]
+        ))
+
+    collected_bans = merge_shard_results(shard_results)
+    if num_bans_to_find is not None:
+        collected_bans = collected_bans[:num_bans_to_find]
+
+    if collected_bans:
+        print(f'Найдено {len(collected_bans)} банов за читы. Сохраняю в {output_name}...')
+        save_results(collected_bans, output_path)
+        print(f'Результаты сохранены в {output_name}')
+    else:
+        print('Результаты не найдены.')
+
+    return collected_bans
+
 def parse_output_file(file_path):
     players = []
     try:
@@ -371,12 +659,17 @@ def update_output_file(file_path, players_to_remove):
         print(f"[-] Ошибка записи файла: {e}")
 
 
-def run_checker(settings):
-    output_paths = [
-        "output.txt",
-        os.path.join(os.path.dirname(__file__), "output.txt"),
-        os.path.join(os.path.dirname(__file__), "FearPunisher", "../output.txt")
-    ]
+def run_checker(settings, output_path: Optional[str] = None):
+    import requests
+
+    if output_path is not None:
+        output_paths = [output_path]
+    else:
+        output_paths = [
+            "output.txt",
+            os.path.join(os.path.dirname(__file__), "output.txt"),
+            os.path.join(os.path.dirname(__file__), "FearPunisher", "../output.txt")
+        ]
 
     output_file = None
     for path in output_paths:
@@ -385,15 +678,15 @@ def run_checker(settings):
             break
 
     if not output_file:
-        print("[-] Файл output.txt не найден!")
-        return
+        print(f"[-] Файл {os.path.basename(output_paths[0])} не найден!")
+        return False
 
     print(f"Проверяю файл: {os.path.abspath(output_file)}")
 
     players = parse_output_file(output_file)
     if not players:
         print("[-] Игроки не найдены в файле!")
-        return
+        return False
 
     print(f"[i] Найдено {len(players)} игроков для проверки")
 
@@ -424,12 +717,15 @@ def run_checker(settings):
         print("\n[+] Нет игроков для удаления")
 
     print(f"[STATS] Проверено: {checked_count}, удалено: {len(players_to_remove)}")
+    return True
 
 class AutoBan:
-    def __init__(self, settings: dict):
+    def __init__(self, settings: dict, output_file: Optional[str] = None):
+        import requests
+
         self.settings = settings
 
-        self.output_file = None
+        self.output_file = output_file
         script_dir = os.path.dirname(os.path.abspath(__file__))
         output_paths = [
             "output.txt",
@@ -437,10 +733,11 @@ class AutoBan:
             os.path.join(script_dir, "FearPunisher", "../output.txt")
         ]
 
-        for path in output_paths:
-            if os.path.exists(path):
-                self.output_file = path
-                break
+        if self.output_file is None:
+            for path in output_paths:
+                if os.path.exists(path):
+                    self.output_file = path
+                    break
 
         if self.output_file is None:
             self.output_file = os.path.join(script_dir, "output.txt")
@@ -622,7 +919,7 @@ class AutoBan:
             return False
 
     def run_autoban(self):
-        print("Запускаю автобан игроков из output.txt...")
+        print(f"Запускаю автобан игроков из {os.path.basename(self.output_file)}...")
         print(f"Файл: {os.path.abspath(self.output_file)}")
         print("-" * 50)
 
@@ -630,7 +927,7 @@ class AutoBan:
 
         if not players:
             print("[-] Не найдено игроков для бана!")
-            return
+            return os.path.exists(self.output_file)
 
         print(f"[i] Найдено {len(players)} игроков")
 
@@ -649,8 +946,11 @@ class AutoBan:
 
         print("-" * 50)
         print(f"[STATS] Результаты: забанено {banned_count}, пропущено {skipped_count}")
+        return True
 
 def show_menu():
+    from colorama import Fore, Style
+
     os.system('cls' if os.name == 'nt' else 'clear')
 
     print(Fore.CYAN + Style.BRIGHT + """
@@ -673,6 +973,10 @@ def show_menu():
     print()
 
 def main():
+    from colorama import init, Fore, Style
+
+    init(autoreset=True)
+
     while True:
         show_menu()
 
@@ -732,5 +1036,97 @@ def main():
 
         input(Fore.CYAN + "\n[*] Нажмите Enter для продолжения..." + Style.RESET_ALL)
 
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='FearPunisher',
+        description='FearPunisher: без аргументов запускается интерактивное меню.'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    parse_cmd = subparsers.add_parser('parse', help='Парсер банов за читы')
+    check_cmd = subparsers.add_parser('check', help='Чекер активных банов')
+    ban_cmd = subparsers.add_parser('ban', help='Авто-бан игроков из файла')
+    pipeline_cmd = subparsers.add_parser('pipeline', help='Парсер, затем чекер и авто-бан')
+    crawl_cmd = subparsers.add_parser('crawl', help='Полный парсинг диапазона страниц в нескольких процессах')
+    export_cmd = subparsers.add_parser('export', help='Выгрузка истории наказаний в файл')
+
+    export_cmd.add_argument('--start-page', type=int, default=1, help='Первая страница (по умолчанию 1)')
+    export_cmd.add_argument('--end-page', type=int, default=None, help='Последняя страница (по умолчанию до первой пустой)')
+    export_cmd.add_argument('--punish-type', type=int, default=0, help='Тип наказания (по умолчанию 0)')
+    export_cmd.add_argument('--newer-than-days', type=float, default=None, help='Только наказания младше указанного числа дней')
+    export_cmd.add_argument('--older-than-days', type=float, default=None, help='Только наказания старше указанного числа дней')
+    export_cmd.add_argument('--output', default=None, help='Путь к файлу выгрузки (по умолчанию punishments.txt)')
+
+    crawl_cmd.add_argument('--start-page', type=int, default=1, help='Первая страница (по умолчанию 1)')
+    crawl_cmd.add_argument('--end-page', type=int, default=None, help='Последняя страница (по умолчанию все страницы)')
+    crawl_cmd.add_argument('--workers', type=int, default=None, help='Количество процессов (по умолчанию число ядер, но не больше 4)')
+    crawl_cmd.add_argument('--count', type=int, default=None, help='Максимальное количество банов (по умолчанию без ограничения)')
+
+    for cmd in (parse_cmd, pipeline_cmd):
+        cmd.add_argument('--start-page', type=int, default=100, help='Стартовая страница (по умолчанию 100)')
+        cmd.add_argument('--count', type=int, default=10, help='Количество банов за читы (по умолчанию 10)')
+
+    for cmd in (parse_cmd, check_cmd, ban_cmd, pipeline_cmd, crawl_cmd):
+        cmd.add_argument('--output', default=None, help='Путь к файлу результатов (по умолчанию output.txt)')
+
+    for cmd in (parse_cmd, pipeline_cmd, crawl_cmd, export_cmd):
+        cmd.add_argument('--hedge', action='store_true', help='Дублировать запрос страницы, если он дольше p95')
+
+    return parser
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    if args.command == 'export':
+        now = time.time()
+        created_after = now - args.newer_than_days * 24 * 60 * 60 if args.newer_than_days is not None else None
+        created_before = now - args.older_than_days * 24 * 60 * 60 if args.older_than_days is not None else None
+        output_path = args.output or os.path.join(os.path.dirname(__file__), 'punishments.txt')
+
+        exported = asyncio.run(export_punishments(output_path, start_page=args.start_page, end_page=args.end_page, punish_type=args.punish_type, created_after=created_after, created_before=created_before, hedge=args.hedge))
+        return 0 if exported else 1
+
+    if args.command == 'crawl':
+        output_path = args.output or os.path.join(os.path.dirname(__file__), 'output.txt')
+        collected_bans = run_sharded_parser(start_page=args.start_page, end_page=args.end_page, workers=args.workers, num_bans_to_find=args.count, output_path=output_path, hedge=args.hedge)
+        return 0 if collected_bans else 1
+
+    if args.command in ('parse', 'pipeline'):
+        if args.count <= 0:
+            print('Количество должно быть больше 0')
+            return 2
+        output_path = args.output or os.path.join(os.path.dirname(__file__), 'output.txt')
+        collected_bans = asyncio.run(run_parser(start_page=args.start_page, num_bans_to_find=args.count, output_path=output_path, hedge=args.hedge, show_progress=False, raise_errors=True))
+        if not collected_bans:
+            print('Баны за читы не найдены, чекер и авто-бан не запускаются.' if args.command == 'pipeline' else 'Баны за читы не найдены.')
+            return 1
+    else:
+        output_path = args.output
+
+    if args.command in ('check', 'pipeline'):
+        if not run_checker(load_settings(), output_path):
+            return 1
+
+    if args.command in ('ban', 'pipeline'):
+        if not AutoBan(load_settings(), output_path).run_autoban():
+            return 1
+
+    return 0
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    if args.command is None:
+        main()
+        return 0
+
+    try:
+        return run_headless(args)
+    except KeyboardInterrupt:
+        print('\nОстановлено пользователем!')
+        return 130
+    except Exception as e:
+        print(f'[-] Ошибка: {e}')
+        return 1
+
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())